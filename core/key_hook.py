@@ -8,19 +8,29 @@ Architecture:
 - Non-grabbed keys are forwarded transparently via a uinput virtual keyboard.
 - Replacement keys are simulated via XTEST on an X11 Display connection
   (owned exclusively by the event thread).
-- Event thread → Qt main thread communication via pyqtSignal.
-- Main thread → event thread communication via queue.Queue.
+- Event thread → Qt main thread communication via a deque of pending
+  key-downs plus one pyqtSignal per evdev read burst.
+- Main thread → event thread communication via a collections.deque, with a
+  self-pipe to wake the (otherwise indefinitely blocking) epoll loop.
 
 This approach works on all Linux desktops (X11, Xwayland compositors like
 Mutter/Muffin/KWin) because evdev operates below the compositor layer.
+
+The loop stays on epoll rather than io_uring: keyboards produce at most a
+few hundred events per second, already read in bursts of up to 64 per
+read(), so there are too few syscalls to be worth an extra native binding.
 """
 
+import collections
 import logging
+import os
 import queue
+import select
+import struct
 import threading
 
 import evdev
-from evdev import InputDevice, UInput, categorize, ecodes
+from evdev import InputDevice, UInput, ecodes
 
 from PyQt5.QtCore import QObject, pyqtSignal
 from Xlib import X, XK, display
@@ -28,6 +38,14 @@ from Xlib.ext import xtest
 
 log = logging.getLogger(__name__)
 
+# evdev EV_KEY event.value convention: 0 = release, 1 = press, 2 = autorepeat.
+_KEY_DOWN = 1
+
+# struct input_event: timeval (sec, usec), type, code, value
+_INPUT_EVENT = struct.Struct('llHHi')
+_READ_SIZE = _INPUT_EVENT.size * 64
+_SYN_REPORT = _INPUT_EVENT.pack(0, 0, ecodes.EV_SYN, ecodes.SYN_REPORT, 0)
+
 
 def _find_keyboards():
     """Return list of evdev paths for real keyboard devices."""
@@ -43,24 +61,34 @@ def _find_keyboards():
     return keyboards
 
 
-# Mapping from evdev key codes to X11 keysyms for common keys.
-# Evdev KEY_* → X11 keysym.  We build this from Xlib at runtime
-# using the X display's keyboard mapping, but we need a static
-# table for keys that don't have a 1:1 keycode correspondence.
-_EVDEV_TO_KEYSYM = {}
-
-def _build_evdev_keysym_table(dpy):
-    """Build evdev-keycode → X11-keysym mapping using the X display."""
-    # X11 keycodes = evdev keycodes + 8
+def _get_keyboard_mapping(dpy):
+    """Fetch the X keyboard mapping. Returns (min_keycode, rows of keysyms)."""
     min_kc = dpy.display.info.min_keycode
     max_kc = dpy.display.info.max_keycode
-    mapping = dpy.get_keyboard_mapping(min_kc, max_kc - min_kc + 1)
+    return min_kc, dpy.get_keyboard_mapping(min_kc, max_kc - min_kc + 1)
+
+
+def _build_keysym_evdev_table(min_kc, mapping):
+    """Build X11-keysym (unshifted) → evdev-keycode mapping."""
+    # X11 keycodes = evdev keycodes + 8
+    table = {}
+    for i, keysyms in enumerate(mapping):
+        if keysyms and keysyms[0]:
+            table[keysyms[0]] = min_kc + i - 8
+    return table
+
+
+def _build_keysym_keycode_table(min_kc, mapping):
+    """Build X11-keysym → (X11 keycode, extra modifiers) for XTEST simulation.
+
+    Only the unshifted and shifted columns are considered; the lowest
+    keycode carrying the keysym wins.
+    """
     table = {}
     for i, keysyms in enumerate(mapping):
-        x_keycode = min_kc + i
-        evdev_keycode = x_keycode - 8
-        if keysyms and keysyms[0] != 0:
-            table[evdev_keycode] = keysyms[0]  # unshifted keysym
+        for idx, ks in enumerate(keysyms[:2]):
+            if ks:
+                table.setdefault(ks, (min_kc + i, X.ShiftMask if idx == 1 else 0))
     return table
 
 
@@ -69,19 +97,28 @@ class X11KeyHook(QObject):
 
     key_intercepted = pyqtSignal(int, int)
     hook_error = pyqtSignal(str)
-    _key_event = pyqtSignal(int, int)  # evdev_keycode, 0 (mods not used yet)
+    _batch_event = pyqtSignal()  # _pending_keys has new entries
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._grabbed = {}        # evdev_keycode → callback
+        self._grabbed = {}        # evdev_keycode → (x11_keysym, x11_mods)
+        self._dispatcher = None   # callable(keysym, modifiers) for grabbed keys
+        self._is_grabbed = bytearray(ecodes.KEY_MAX + 1)  # hot-path membership
         self._grabbed_with_mods = {}  # (evdev_keycode, x11_mods) → callback
         self._keysym_to_evdev = {}  # x11_keysym → evdev_keycode
-        self._evdev_to_keysym = {}
+        self._keysym_to_kc_shift = {}  # x11_keysym → (x11_keycode, extra_mods)
+        self._mod_bit_to_kc = []  # [(modifier bit, x11_keycode)] (event thread)
         self._running = False
         self._thread = None
-        self._cmd_q = queue.Queue()
+        self._cmd_q = collections.deque(maxlen=1024)  # append/popleft are atomic
         self._result_q = queue.Queue()
-        self._key_event.connect(self._on_key_event)
+        # Self-pipe: written to by the main thread to wake the event loop
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._wake_pending = False  # a wake byte is in flight for _cmd_q
+        self._pending_keys = collections.deque()  # evdev_keycode
+        self._batch_event.connect(self._drain_pending)
 
     def start(self):
         if self._running:
@@ -111,17 +148,31 @@ class X11KeyHook(QObject):
         if not self._running:
             return
         self._running = False
+        self._wake()
         if self._thread:
             self._thread.join(timeout=2)
             self._thread = None
         self._grabbed.clear()
+        self._is_grabbed[:] = bytes(len(self._is_grabbed))
         self._grabbed_with_mods.clear()
         log.info("X11KeyHook stopped")
 
     def cleanup(self):
         self.stop()
+        for fd in (self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def set_dispatcher(self, dispatcher):
+        """Set the callable(keysym, modifiers) invoked for every grabbed key-down.
 
-    def grab_key(self, keysym, modifiers, callback):
+        It receives the keysym and modifiers the key was grabbed with.
+        """
+        self._dispatcher = dispatcher
+
+    def grab_key(self, keysym, modifiers):
         """Grab a key. Returns True on success."""
         if not self._running:
             self.hook_error.emit("Hook not started")
@@ -135,7 +186,8 @@ class X11KeyHook(QObject):
         if ev_kc in self._grabbed:
             return False
 
-        self._grabbed[ev_kc] = callback
+        self._grabbed[ev_kc] = (keysym, modifiers)
+        self._is_grabbed[ev_kc] = 1
         log.info("Grabbed evdev keycode=%d (keysym=0x%x)", ev_kc, keysym)
         return True
 
@@ -144,14 +196,41 @@ class X11KeyHook(QObject):
         ev_kc = self._keysym_to_evdev.get(keysym)
         if ev_kc is None:
             return
+        self._is_grabbed[ev_kc] = 0
         self._grabbed.pop(ev_kc, None)
         log.info("Ungrabbed evdev keycode=%d", ev_kc)
 
+    def ungrab_many(self, keys):
+        """Ungrab several (keysym, modifiers) pairs in one pass."""
+        ungrabbed = []
+        for keysym, _modifiers in keys:
+            ev_kc = self._keysym_to_evdev.get(keysym)
+            if ev_kc is None:
+                continue
+            self._is_grabbed[ev_kc] = 0
+            self._grabbed.pop(ev_kc, None)
+            ungrabbed.append(ev_kc)
+        if ungrabbed:
+            log.info("Ungrabbed evdev keycodes=%s", ungrabbed)
+
     def simulate_key(self, keysym, modifiers):
         """Queue a key simulation (fire-and-forget)."""
         if not self._running:
             return
-        self._cmd_q.put(('simulate', keysym, modifiers))
+        self._cmd_q.append(('simulate', keysym, modifiers))
+        # Only write to the pipe if the event thread has not yet been told
+        # to drain; commands queued before it clears the flag are picked up
+        # by the same drain.
+        if not self._wake_pending:
+            self._wake_pending = True
+            self._wake()
+
+    def _wake(self):
+        """Wake the event thread out of epoll.poll()."""
+        try:
+            os.write(self._wake_w, b"x")
+        except (BlockingIOError, OSError):
+            pass  # pipe full (already pending) or closed
 
     # ── event thread ─────────────────────────────────────────────
 
@@ -168,9 +247,10 @@ class X11KeyHook(QObject):
             self._result_q.put(False)
             return
 
-        # Build keysym ↔ evdev keycode tables
-        self._evdev_to_keysym = _build_evdev_keysym_table(dpy)
-        self._keysym_to_evdev = {v: k for k, v in self._evdev_to_keysym.items()}
+        # Build keysym → keycode tables from one keyboard-mapping fetch
+        min_kc, mapping = _get_keyboard_mapping(dpy)
+        self._keysym_to_evdev = _build_keysym_evdev_table(min_kc, mapping)
+        self._refresh_keymap(dpy, min_kc, mapping)
 
         # Open keyboard devices and grab them
         devices = []
@@ -209,91 +289,164 @@ class X11KeyHook(QObject):
         log.info("X11KeyHook started (evdev + XTEST)")
         self._result_q.put(True)
 
-        # Event loop
+        # Event loop: block until a device or the X connection is readable,
+        # or we are woken
         selector_map = {dev.fd: dev for dev in devices}
-        import select
+        x_fd = dpy.fileno()
+        epoll = select.epoll()
+        for fd in selector_map:
+            epoll.register(fd, select.EPOLLIN)
+        epoll.register(self._wake_r, select.EPOLLIN)
+        epoll.register(x_fd, select.EPOLLIN)
 
-        while self._running:
-            # Process simulation commands
-            self._drain_commands(dpy)
-
-            # Wait for events with a short timeout
-            try:
-                readable, _, _ = select.select(
-                    list(selector_map.keys()), [], [], 0.02
-                )
-            except (ValueError, OSError):
-                break
+        try:
+            # Events queued by python-xlib during the setup round-trips would
+            # otherwise wait for unrelated X traffic to make the fd readable
+            self._drain_x_events(dpy)
 
-            for fd in readable:
-                dev = selector_map.get(fd)
-                if dev is None:
-                    continue
+            while self._running:
                 try:
-                    for event in dev.read():
-                        self._handle_evdev_event(event, uinput, dpy)
-                except (OSError, IOError):
-                    log.warning("Lost device: %s", dev.name)
-                    selector_map.pop(fd, None)
-
-        # Cleanup
-        try:
-            uinput.close()
+                    ready = epoll.poll()
+                except InterruptedError:
+                    continue
+                except OSError:
+                    break
+
+                for fd, _ in ready:
+                    if fd == self._wake_r:
+                        try:
+                            os.read(self._wake_r, 4096)
+                        except (BlockingIOError, OSError):
+                            pass
+                        # Clear before draining so a concurrent simulate_key()
+                        # either lands in this drain or writes a new wake byte.
+                        self._wake_pending = False
+                        self._drain_commands(dpy)
+                        # Replies to our requests may have buffered X events
+                        self._drain_x_events(dpy)
+                        continue
+                    if fd == x_fd:
+                        self._drain_x_events(dpy)
+                        continue
+                    dev = selector_map.get(fd)
+                    if dev is None:
+                        continue
+                    try:
+                        data = os.read(fd, _READ_SIZE)
+                    except BlockingIOError:
+                        continue
+                    except OSError:
+                        data = b""
+                    if data:
+                        self._handle_evdev_batch(data, uinput.fd)
+                    else:
+                        log.warning("Lost device: %s", dev.name)
+                        selector_map.pop(fd, None)
+                        try:
+                            epoll.unregister(fd)
+                        except (OSError, ValueError):
+                            pass
         except Exception:
-            pass
-        for dev in devices:
+            # e.g. Xlib ConnectionClosedError from the X drain: stop cleanly
+            # instead of leaving devices grabbed and remapping dead
+            log.exception("Event loop failed")
+            self._running = False
+            self.hook_error.emit("Event loop stopped unexpectedly")
+        finally:
+            # Cleanup
+            epoll.close()
             try:
-                dev.ungrab()
-                dev.close()
+                uinput.close()
             except Exception:
                 pass
-        try:
-            dpy.close()
-        except Exception:
-            pass
-        log.debug("Event thread exited")
-
-    def _handle_evdev_event(self, event, uinput, dpy):
-        """Process a single evdev event."""
-        if event.type != ecodes.EV_KEY:
-            # Forward non-key events (SYN, etc.) transparently
-            uinput.write_event(event)
-            uinput.syn()
-            return
-
-        key_event = categorize(event)
-        ev_keycode = event.code
-
-        # Is this key grabbed?
-        if ev_keycode in self._grabbed:
-            # Only fire on key-down (not repeat or release)
-            if key_event.keystate == key_event.key_down:
-                self._key_event.emit(ev_keycode, 0)
-            # Suppress: don't forward to uinput
-            return
-
-        # Not grabbed — forward transparently
-        uinput.write_event(event)
-        uinput.syn()
+            for dev in devices:
+                try:
+                    dev.ungrab()
+                    dev.close()
+                except Exception:
+                    pass
+            try:
+                dpy.close()
+            except Exception:
+                pass
+            log.debug("Event thread exited")
+
+    def _handle_evdev_batch(self, data, uinput_fd):
+        """Process one raw read() burst, forwarding with a single SYN_REPORT.
+
+        Non-grabbed events are copied as raw input_event bytes into one
+        buffer, terminated by a single SYN_REPORT and written with one
+        write() to the uinput fd.
+        """
+        size = _INPUT_EVENT.size
+        out = bytearray()
+        queued = False
+        for i, (_sec, _usec, etype, code, value) in enumerate(
+                _INPUT_EVENT.iter_unpack(data)):
+            if etype == ecodes.EV_SYN:
+                # Incoming SYN_REPORTs are replaced by the one appended below
+                continue
+
+            # Is this key grabbed?
+            if etype == ecodes.EV_KEY and self._is_grabbed[code]:
+                # Only fire on key-down (not repeat or release)
+                if value == _KEY_DOWN:
+                    self._pending_keys.append(code)
+                    queued = True
+                # Suppress: don't forward to uinput
+                continue
+
+            # Not grabbed (or not a key event) — forward transparently
+            out += data[i * size:(i + 1) * size]
+
+        if out:
+            out += _SYN_REPORT
+            os.write(uinput_fd, out)
+        if queued:
+            self._batch_event.emit()
+
+    def _drain_x_events(self, dpy):
+        """Read every pending X event; refresh cached keymaps on MappingNotify.
+
+        _refresh_keymap() waits for a reply, and python-xlib queues any
+        events that arrive meanwhile without leaving the socket readable,
+        so keep draining until a pass sees no further MappingNotify.
+        """
+        while True:
+            refresh = False
+            while dpy.pending_events():
+                evt = dpy.next_event()
+                if evt.type == X.MappingNotify:
+                    dpy.refresh_keyboard_mapping(evt)
+                    refresh = True
+            if not refresh:
+                return
+            log.info("Keyboard mapping changed, refreshing keymap cache")
+            self._refresh_keymap(dpy)
 
     def _drain_commands(self, dpy):
-        """Process pending simulation commands."""
-        while not self._cmd_q.empty():
+        """Process pending simulation commands, flushing once per burst."""
+        did_work = False
+        while True:
             try:
-                cmd = self._cmd_q.get_nowait()
-            except queue.Empty:
+                cmd = self._cmd_q.popleft()
+            except IndexError:
                 break
             if cmd[0] == 'simulate':
                 self._do_simulate(dpy, cmd[1], cmd[2])
+                did_work = True
+        if did_work:
+            # XTEST requests have no reply; a one-way flush is enough
+            dpy.flush()
 
     def _do_simulate(self, dpy, keysym, modifiers):
-        """Simulate a key press+release via XTEST."""
+        """Queue a key press+release via XTEST (flushed by _drain_commands)."""
         keycode, extra_mods = self._resolve_keysym(dpy, keysym)
         if keycode is None or keycode == 0:
             return
 
         combined = modifiers | extra_mods
-        mod_kcs = self._modifier_keycodes(dpy, combined)
+        mod_kcs = self._modifier_keycodes(combined)
 
         for mc in mod_kcs:
             xtest.fake_input(dpy, X.KeyPress, mc)
@@ -301,41 +454,44 @@ class X11KeyHook(QObject):
         xtest.fake_input(dpy, X.KeyRelease, keycode)
         for mc in reversed(mod_kcs):
             xtest.fake_input(dpy, X.KeyRelease, mc)
-        dpy.sync()
 
-    @staticmethod
-    def _resolve_keysym(dpy, keysym):
+    def _refresh_keymap(self, dpy, min_kc=None, mapping=None):
+        """(Re)build the cached keysym → keycode and modifier keycode tables."""
+        if mapping is None:
+            min_kc, mapping = _get_keyboard_mapping(dpy)
+        self._keysym_to_kc_shift = _build_keysym_keycode_table(min_kc, mapping)
+        self._mod_bit_to_kc = [
+            (bit, dpy.keysym_to_keycode(ksym))
+            for bit, ksym in [(0, XK.XK_Shift_L), (2, XK.XK_Control_L),
+                              (3, XK.XK_Alt_L), (6, XK.XK_Super_L)]
+        ]
+
+    def _resolve_keysym(self, dpy, keysym):
         """Find X11 keycode + modifier for a keysym."""
-        min_kc = dpy.display.info.min_keycode
-        max_kc = dpy.display.info.max_keycode
-        mapping = dpy.get_keyboard_mapping(min_kc, max_kc - min_kc + 1)
-        for i, keysyms in enumerate(mapping):
-            for idx, ks in enumerate(keysyms):
-                if ks == keysym and idx <= 1:
-                    return min_kc + i, X.ShiftMask if idx == 1 else 0
+        # Kept current by _drain_x_events() on MappingNotify
+        entry = self._keysym_to_kc_shift.get(keysym)
+        if entry is not None:
+            return entry
         kc = dpy.keysym_to_keycode(keysym)
         return (kc, 0) if kc != 0 else (None, 0)
 
-    @staticmethod
-    def _modifier_keycodes(dpy, modifiers):
-        kcs = []
-        for bit, ksym in [(0, XK.XK_Shift_L), (2, XK.XK_Control_L),
-                           (3, XK.XK_Alt_L), (6, XK.XK_Super_L)]:
-            if modifiers & (1 << bit):
-                kc = dpy.keysym_to_keycode(ksym)
-                if kc:
-                    kcs.append(kc)
-        return kcs
+    def _modifier_keycodes(self, modifiers):
+        return [kc for bit, kc in self._mod_bit_to_kc
+                if kc and (modifiers >> bit) & 1]
 
     # ── main-thread signal handler ───────────────────────────────
 
-    def _on_key_event(self, ev_keycode, mods):
-        """Main thread: look up callback and invoke it."""
-        callback = self._grabbed.get(ev_keycode)
-        if callback:
-            keysym = self._evdev_to_keysym.get(ev_keycode, 0)
-            log.debug("Key callback: evdev=%d keysym=0x%x", ev_keycode, keysym)
+    def _drain_pending(self):
+        """Main thread: dispatch every queued key-down to the dispatcher."""
+        while True:
             try:
-                callback(ev_keycode, mods)
-            except Exception:
-                log.exception("Error in key callback")
+                ev_keycode = self._pending_keys.popleft()
+            except IndexError:
+                break
+            grabbed = self._grabbed.get(ev_keycode)
+            if grabbed and self._dispatcher:
+                log.debug("Key dispatch: evdev=%d keysym=0x%x", ev_keycode, grabbed[0])
+                try:
+                    self._dispatcher(*grabbed)
+                except Exception:
+                    log.exception("Error in key dispatcher")
@@ -2,6 +2,9 @@
 Bidirectional mapping between Qt key codes, X11 keysyms, and human-readable names.
 """
 
+from functools import lru_cache
+from types import MappingProxyType
+
 from PyQt5.QtCore import Qt
 from Xlib import XK
 
@@ -92,6 +95,36 @@ _MODIFIER_NAMES = [
     (MOD_SUPER, "Super"),
 ]
 
+
+@lru_cache(maxsize=None)
+def _xk_names():
+    """X11-keysym → XK name (e.g. 0xffab → 'KP_Add'), built on first use.
+
+    Only needed for keysyms outside _SPECIAL_KEYS, so it is kept off the
+    import/startup path.
+    """
+    table = {}
+    for attr, value in vars(XK).items():
+        if attr.startswith("XK_") and isinstance(value, int):
+            table.setdefault(value, attr[3:])
+    return MappingProxyType(table)
+
+
+# Latin-1 code point → keysym (keysym == code point for printable Latin-1;
+# control characters have no keysym)
+_LATIN_KEYSYM = [None] * 256
+_LATIN_KEYSYM[0x20:0x7F] = range(0x20, 0x7F)
+_LATIN_KEYSYM[0xA0:0x100] = range(0xA0, 0x100)
+
+# Modifier mask (low byte) → "Ctrl+Shift+"-style prefix, for describe_combo
+_MOD_PREFIXES = tuple(
+    "".join(f"{name}+" for mask, name in _MODIFIER_NAMES if mods & mask)
+    for mods in range(256)
+)
+
+# Lower-case modifier name → modifier bit, for parsing
+_MOD_LOOKUP = {name.lower(): mask for mask, name in _MODIFIER_NAMES}
+
 # Qt modifier flags → our modifier bits
 _QT_MODIFIER_MAP = {
     Qt.ShiftModifier: MOD_SHIFT,
@@ -101,40 +134,96 @@ _QT_MODIFIER_MAP = {
 }
 
 
+def _build_tables():
+    """Build the (qt→keysym, keysym→name, name→keysym, keysym→qt) tables."""
+    qt_to_keysym = {}
+    keysym_to_name = {}
+    name_to_keysym = {}
+    keysym_to_qt = {}
+
+    def add(qt_key, keysym, name):
+        qt_to_keysym[qt_key] = keysym
+        keysym_to_name[keysym] = name
+        name_to_keysym[name.lower()] = keysym
+        keysym_to_qt[keysym] = qt_key
+
+    for qt_key, keysym, name in _SPECIAL_KEYS:
+        add(qt_key, keysym, name)
+
+    # Latin letters: Qt.Key_A (0x41) maps to XK_a (0x61)
+    for i in range(26):
+        add(Qt.Key_A + i, XK.XK_a + i, chr(ord('A') + i))
+
+    # Digits: Qt.Key_0 (0x30) maps to XK_0 (0x30)
+    for i in range(10):
+        add(Qt.Key_0 + i, XK.XK_0 + i, str(i))
+
+    return tuple(MappingProxyType(t) for t in
+                 (qt_to_keysym, keysym_to_name, name_to_keysym, keysym_to_qt))
+
+
+# Built once at import; shared read-only by every resolver instance.
+_QT_TO_KEYSYM, _KEYSYM_TO_NAME, _NAME_TO_KEYSYM, _KEYSYM_TO_QT = _build_tables()
+
+
+@lru_cache(maxsize=512)
+def _lookup_name(name):
+    """Convert a human-readable name to an X11 keysym. Returns None if unknown."""
+    result = _NAME_TO_KEYSYM.get(name.lower())
+    if result:
+        return result
+    # Fallback: try Xlib's string_to_keysym
+    sym = XK.string_to_keysym(name)
+    return sym if sym != 0 else None
+
+
+@lru_cache(maxsize=512)
+def _keysym_name(keysym):
+    """Cached implementation of KeyNameResolver.keysym_to_name."""
+    name = _KEYSYM_TO_NAME.get(keysym)
+    if name:
+        return name
+    # Fallback: use Xlib's keysym_to_string, then the XK constant name
+    s = XK.keysym_to_string(keysym)
+    if s:
+        return s
+    name = _xk_names().get(keysym)
+    if name:
+        return name
+    return f"0x{keysym:04x}"
+
+
+@lru_cache(maxsize=512)
+def _describe_combo(keysym, modifiers):
+    """Cached implementation of KeyNameResolver.describe_combo."""
+    return _MOD_PREFIXES[modifiers & 0xFF] + _keysym_name(keysym)
+
+
+@lru_cache(maxsize=256)
+def _parse_key_combo(combo_str):
+    """Cached implementation of KeyNameResolver.parse_key_combo."""
+    parts = combo_str.strip().split("+")
+    modifiers = 0
+    key_part = None
+
+    for part in parts:
+        lower = part.strip().lower()
+        if lower in _MOD_LOOKUP:
+            modifiers |= _MOD_LOOKUP[lower]
+        else:
+            key_part = part.strip()
+
+    if key_part is None:
+        return None, 0
+
+    return _lookup_name(key_part), modifiers
+
+
 class KeyNameResolver:
     """Resolves between Qt key codes, X11 keysyms, and human-readable names."""
 
     def __init__(self):
-        self._qt_to_keysym = {}
-        self._keysym_to_name = {}
-        self._name_to_keysym = {}
-        self._keysym_to_qt = {}
-
-        for qt_key, keysym, name in _SPECIAL_KEYS:
-            self._qt_to_keysym[qt_key] = keysym
-            self._keysym_to_name[keysym] = name
-            self._name_to_keysym[name.lower()] = keysym
-            self._keysym_to_qt[keysym] = qt_key
-
-        # Latin letters: Qt.Key_A (0x41) maps to XK_a (0x61)
-        for i in range(26):
-            qt_key = Qt.Key_A + i
-            keysym = XK.XK_a + i
-            name = chr(ord('A') + i)
-            self._qt_to_keysym[qt_key] = keysym
-            self._keysym_to_name[keysym] = name
-            self._name_to_keysym[name.lower()] = keysym
-            self._keysym_to_qt[keysym] = qt_key
-
-        # Digits: Qt.Key_0 (0x30) maps to XK_0 (0x30)
-        for i in range(10):
-            qt_key = Qt.Key_0 + i
-            keysym = XK.XK_0 + i
-            name = str(i)
-            self._qt_to_keysym[qt_key] = keysym
-            self._keysym_to_name[keysym] = name
-            self._name_to_keysym[name] = keysym
-            self._keysym_to_qt[keysym] = qt_key
+        self._qt_to_keysym = _QT_TO_KEYSYM
 
     def qt_key_to_keysym(self, qt_key):
         """Convert a Qt key code to an X11 keysym. Returns None if unknown."""
@@ -142,23 +231,11 @@ class KeyNameResolver:
 
     def keysym_to_name(self, keysym):
         """Convert an X11 keysym to a human-readable name."""
-        name = self._keysym_to_name.get(keysym)
-        if name:
-            return name
-        # Fallback: use Xlib's keysym_to_string
-        s = XK.keysym_to_string(keysym)
-        if s:
-            return s
-        return f"0x{keysym:04x}"
+        return _keysym_name(keysym)
 
     def name_to_keysym(self, name):
         """Convert a human-readable name to an X11 keysym. Returns None if unknown."""
-        result = self._name_to_keysym.get(name.lower())
-        if result:
-            return result
-        # Fallback: try Xlib's string_to_keysym
-        sym = XK.string_to_keysym(name)
-        return sym if sym != 0 else None
+        return _lookup_name(name)
 
     def qt_modifiers_to_x11(self, qt_modifiers):
         """Convert Qt modifier flags to X11 modifier mask."""
@@ -170,45 +247,21 @@ class KeyNameResolver:
 
     def describe_combo(self, keysym, modifiers):
         """Return a human-readable string like 'Ctrl+Shift+A'."""
-        parts = []
-        for mod_mask, mod_name in _MODIFIER_NAMES:
-            if modifiers & mod_mask:
-                parts.append(mod_name)
-        parts.append(self.keysym_to_name(keysym))
-        return "+".join(parts)
+        return _describe_combo(keysym, modifiers)
 
     def char_to_keysym(self, char):
         """Convert a single character to its X11 keysym. Returns None on failure."""
         if len(char) != 1:
             return None
-        # For Latin-1 range (0x20-0xFF), keysym == Unicode code point
         code = ord(char)
-        if 0x20 <= code <= 0x7E:
-            return code
-        if 0xA0 <= code <= 0xFF:
-            return code
         # For Unicode above Latin-1, keysym = 0x01000000 + code point
-        if code > 0xFF:
-            return 0x01000000 + code
-        return None
+        return _LATIN_KEYSYM[code] if code < 256 else 0x01000000 + code
+
+    def chars_to_keysyms(self, text):
+        """Convert each character of a string to its X11 keysym (None on failure)."""
+        return [_LATIN_KEYSYM[c] if c < 256 else 0x01000000 + c
+                for c in map(ord, text)]
 
     def parse_key_combo(self, combo_str):
         """Parse 'Ctrl+Shift+A' into (keysym, modifiers). Returns (None, 0) on failure."""
-        parts = combo_str.strip().split("+")
-        modifiers = 0
-        key_part = None
-
-        mod_lookup = {name.lower(): mask for mask, name in _MODIFIER_NAMES}
-
-        for part in parts:
-            lower = part.strip().lower()
-            if lower in mod_lookup:
-                modifiers |= mod_lookup[lower]
-            else:
-                key_part = part.strip()
-
-        if key_part is None:
-            return None, 0
-
-        keysym = self.name_to_keysym(key_part)
-        return keysym, modifiers
+        return _parse_key_combo(combo_str)
@@ -4,15 +4,22 @@ Key remapping lifecycle: manages mappings, grabs, conflict detection, persistenc
 
 import logging
 import uuid
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields
 
 from PyQt5.QtCore import QObject, pyqtSignal
 
 log = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class KeyMapping:
+    """A single source → target key mapping.
+
+    cached_dict() memoizes to_dict() for persistence. Nothing invalidates it
+    automatically: every code path that changes a field must call
+    mark_dirty() afterwards, or stale data will be saved.
+    """
+
     id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
     source_keysym: int = 0
     source_modifiers: int = 0
@@ -20,13 +27,42 @@ class KeyMapping:
     target_modifiers: int = 0
     enabled: bool = True
     description: str = ""
+    _dict_cache: dict = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self):
-        return asdict(self)
+        # All fields are flat scalars, so asdict()'s recursive copy is not needed
+        return {
+            "id": self.id,
+            "source_keysym": self.source_keysym,
+            "source_modifiers": self.source_modifiers,
+            "target_keysym": self.target_keysym,
+            "target_modifiers": self.target_modifiers,
+            "enabled": self.enabled,
+            "description": self.description,
+        }
+
+    def cached_dict(self):
+        """Return to_dict(), reused until mark_dirty() is called."""
+        if self._dict_cache is None:
+            self._dict_cache = self.to_dict()
+        return self._dict_cache
+
+    def mark_dirty(self):
+        """Invalidate the cached_dict() after a field is changed."""
+        self._dict_cache = None
 
     @classmethod
     def from_dict(cls, d):
-        return cls(**{k: v for k, v in d.items() if k in cls.__dataclass_fields__})
+        return cls(**{k: v for k, v in d.items() if k in _INIT_FIELDS})
+
+    @classmethod
+    def from_trusted_dict(cls, d):
+        """Like from_dict() but without filtering, for our own to_dict() output."""
+        return cls(**d)
+
+
+# Fields accepted by KeyMapping.__init__ (excludes the internal _dict_cache)
+_INIT_FIELDS = frozenset(f.name for f in fields(KeyMapping) if f.init)
 
 
 class KeyRemapper(QObject):
@@ -35,6 +71,7 @@ class KeyRemapper(QObject):
     mapping_added = pyqtSignal(object)      # KeyMapping
     mapping_removed = pyqtSignal(str)        # mapping id
     mapping_toggled = pyqtSignal(str, bool)  # mapping id, enabled
+    mappings_bulk_toggled = pyqtSignal(list, bool)  # mapping ids, enabled
     error_occurred = pyqtSignal(str)
 
     def __init__(self, hook, storage, key_names, parent=None):
@@ -43,6 +80,9 @@ class KeyRemapper(QObject):
         self._storage = storage
         self._key_names = key_names
         self._mappings = {}  # id → KeyMapping
+        self._by_source = {}  # (source_keysym, source_modifiers) → KeyMapping
+        self._active_count = 0  # number of mappings with enabled=True
+        self._hook.set_dispatcher(self._dispatch)
 
     @property
     def mappings(self):
@@ -51,10 +91,20 @@ class KeyRemapper(QObject):
     def load_from_storage(self):
         """Restore mappings from disk and grab enabled ones."""
         saved = self._storage.load_mappings()
+        trusted = self._storage.is_current_version()
         for d in saved:
-            mapping = KeyMapping.from_dict(d)
+            mapping = None
+            if trusted:
+                try:
+                    mapping = KeyMapping.from_trusted_dict(d)
+                except TypeError:
+                    pass  # hand-edited entry with unknown keys
+            if mapping is None:
+                mapping = KeyMapping.from_dict(d)
             self._mappings[mapping.id] = mapping
+            self._by_source[(mapping.source_keysym, mapping.source_modifiers)] = mapping
             if mapping.enabled:
+                self._active_count += 1
                 self._grab(mapping)
             self.mapping_added.emit(mapping)
 
@@ -62,14 +112,12 @@ class KeyRemapper(QObject):
                     target_keysym, target_modifiers, description=""):
         """Add a new mapping. Returns the KeyMapping or None on conflict."""
         # Conflict detection: same source key+mods already mapped?
-        for m in self._mappings.values():
-            if (m.source_keysym == source_keysym
-                    and m.source_modifiers == source_modifiers):
-                self.error_occurred.emit(
-                    f"Source key already mapped: "
-                    f"{self._key_names.describe_combo(source_keysym, source_modifiers)}"
-                )
-                return None
+        if (source_keysym, source_modifiers) in self._by_source:
+            self.error_occurred.emit(
+                f"Source key already mapped: "
+                f"{self._key_names.describe_combo(source_keysym, source_modifiers)}"
+            )
+            return None
 
         mapping = KeyMapping(
             source_keysym=source_keysym,
@@ -83,6 +131,8 @@ class KeyRemapper(QObject):
             return None
 
         self._mappings[mapping.id] = mapping
+        self._by_source[(source_keysym, source_modifiers)] = mapping
+        self._active_count += 1
         self._persist()
         self.mapping_added.emit(mapping)
         return mapping
@@ -92,7 +142,9 @@ class KeyRemapper(QObject):
         mapping = self._mappings.pop(mapping_id, None)
         if mapping is None:
             return
+        self._by_source.pop((mapping.source_keysym, mapping.source_modifiers), None)
         if mapping.enabled:
+            self._active_count -= 1
             self._ungrab(mapping)
         self._persist()
         self.mapping_removed.emit(mapping_id)
@@ -113,31 +165,48 @@ class KeyRemapper(QObject):
             self._ungrab(mapping)
 
         mapping.enabled = enabled
+        mapping.mark_dirty()
+        self._active_count += 1 if enabled else -1
         self._persist()
         self.mapping_toggled.emit(mapping_id, enabled)
 
     def active_count(self):
         """Return number of currently enabled mappings."""
-        return sum(1 for m in self._mappings.values() if m.enabled)
+        return self._active_count
 
     def enable_all(self):
+        changed = []
         for m in self._mappings.values():
-            if not m.enabled:
-                self.toggle_mapping(m.id, True)
+            if m.enabled:
+                continue
+            if not self._grab(m):
+                continue
+            m.enabled = True
+            m.mark_dirty()
+            changed.append(m)
+        if not changed:
+            return
+        self._active_count += len(changed)
+        self._persist()
+        self.mappings_bulk_toggled.emit([m.id for m in changed], True)
 
     def disable_all(self):
-        for m in self._mappings.values():
-            if m.enabled:
-                self.toggle_mapping(m.id, False)
+        changed = [m for m in self._mappings.values() if m.enabled]
+        if not changed:
+            return
+        self._hook.ungrab_many(
+            (m.source_keysym, m.source_modifiers) for m in changed
+        )
+        for m in changed:
+            m.enabled = False
+            m.mark_dirty()
+        self._active_count -= len(changed)
+        self._persist()
+        self.mappings_bulk_toggled.emit([m.id for m in changed], False)
 
     def _grab(self, mapping):
-        """Grab the source key and register a callback that simulates the target."""
-        def on_key(keysym, mods):
-            self._hook.simulate_key(mapping.target_keysym, mapping.target_modifiers)
-
-        ok = self._hook.grab_key(
-            mapping.source_keysym, mapping.source_modifiers, on_key
-        )
+        """Grab the source key; _dispatch simulates the target when it fires."""
+        ok = self._hook.grab_key(mapping.source_keysym, mapping.source_modifiers)
         if not ok:
             self.error_occurred.emit(
                 f"Failed to grab "
@@ -145,9 +214,15 @@ class KeyRemapper(QObject):
             )
         return ok
 
+    def _dispatch(self, keysym, mods):
+        """Hook callback for every grabbed key-down: simulate the mapped target."""
+        mapping = self._by_source.get((keysym, mods))
+        if mapping is not None and mapping.enabled:
+            self._hook.simulate_key(mapping.target_keysym, mapping.target_modifiers)
+
     def _ungrab(self, mapping):
         self._hook.ungrab_key(mapping.source_keysym, mapping.source_modifiers)
 
     def _persist(self):
-        data = [m.to_dict() for m in self._mappings.values()]
+        data = [m.cached_dict() for m in self._mappings.values()]
         self._storage.save_mappings(data)
@@ -3,24 +3,54 @@ JSON persistence for key mappings and settings.
 Config directory: ~/.config/rekey/
 """
 
+import errno
+import hashlib
 import json
 import logging
 import os
+import shutil
 import tempfile
 
+from PyQt5.QtCore import QTimer
+
+try:
+    import orjson
+except ImportError:  # optional: faster (de)serialization
+    orjson = None
+
 log = logging.getLogger(__name__)
 
 _CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".config", "rekey")
 _MAPPINGS_FILE = os.path.join(_CONFIG_DIR, "mappings.json")
+CONFIG_VERSION = 1  # bump when the mapping dict layout changes
+_SAVE_DELAY_MS = 200  # coalesce bursts of mutations into one write
+
+
+def _make_default():
+    """Return a fresh copy of the default config data."""
+    return {
+        "version": CONFIG_VERSION,
+        "mappings": [],
+        "settings": {
+            "start_minimized": False,
+            "enable_on_startup": True,
+        },
+    }
 
-_DEFAULT_DATA = {
-    "version": 1,
-    "mappings": [],
-    "settings": {
-        "start_minimized": False,
-        "enable_on_startup": True,
-    },
-}
+
+def _dumps(data):
+    """Serialize config data to indented JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    # Match orjson: raw UTF-8 rather than \uXXXX escapes
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(raw):
+    """Parse JSON bytes. Raises json.JSONDecodeError on malformed input."""
+    if orjson is not None:
+        return orjson.loads(raw)  # orjson.JSONDecodeError subclasses it
+    return json.loads(raw)
 
 
 class Storage:
@@ -30,6 +60,43 @@ class Storage:
         self._config_dir = config_dir or _CONFIG_DIR
         self._mappings_file = os.path.join(self._config_dir, "mappings.json")
         self._data = None
+        self._last_hash = None  # SHA-256 of the bytes last read/written
+        self._check_same_filesystem()
+        self._save_timer = QTimer()
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(_SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self._save_now)
+
+    def _check_same_filesystem(self):
+        """Warn if the config file lives on a different filesystem than its
+        directory (e.g. a bind-mounted file), where os.replace() fails."""
+        try:
+            dir_dev = os.stat(self._config_dir).st_dev
+            file_dev = os.stat(self._mappings_file).st_dev
+        except OSError:
+            return
+        if dir_dev != file_dev:
+            log.warning("%s is on a different filesystem than %s; "
+                        "saves will not be atomic",
+                        self._mappings_file, self._config_dir)
+
+    def _replace(self, tmp_path):
+        """os.replace() the temp file over the config, copying across filesystems."""
+        try:
+            os.replace(tmp_path, self._mappings_file)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            log.warning("Cross-device rename, falling back to copy for %s",
+                        self._mappings_file)
+            shutil.copyfile(tmp_path, self._mappings_file)
+            # The copy overwrites in place, so make its data durable too
+            fd = os.open(self._mappings_file, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.unlink(tmp_path)
 
     def _ensure_dir(self):
         os.makedirs(self._config_dir, exist_ok=True)
@@ -40,24 +107,52 @@ class Storage:
             return
         if os.path.exists(self._mappings_file):
             try:
-                with open(self._mappings_file, "r") as f:
-                    self._data = json.load(f)
+                with open(self._mappings_file, "rb") as f:
+                    raw = f.read()
+                self._data = _loads(raw)
+                self._last_hash = hashlib.sha256(raw).digest()
                 log.info("Loaded config from %s", self._mappings_file)
                 return
             except (json.JSONDecodeError, OSError) as e:
                 log.warning("Failed to load config: %s", e)
-        self._data = json.loads(json.dumps(_DEFAULT_DATA))  # deep copy
+        self._data = _make_default()
 
-    def _save(self):
-        """Atomic write: write to tmp file then os.replace()."""
+    def _schedule_save(self):
+        """Mark data dirty; it is written once the debounce timer fires."""
+        self._save_timer.start()
+
+    def flush(self):
+        """Write any pending changes immediately."""
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self._save_now()
+
+    def _save_now(self):
+        """Atomic write: write to tmp file then os.replace().
+
+        Skipped when the serialized data matches what is already on disk.
+        """
+        payload = _dumps(self._data)
+        digest = hashlib.sha256(payload).digest()
+        if digest == self._last_hash:
+            log.debug("Config unchanged, skipping save")
+            return
         self._ensure_dir()
         fd, tmp_path = tempfile.mkstemp(
             dir=self._config_dir, suffix=".tmp", prefix="mappings_"
         )
         try:
-            with os.fdopen(fd, "w") as f:
-                json.dump(self._data, f, indent=2)
-            os.replace(tmp_path, self._mappings_file)
+            try:
+                view = memoryview(payload)
+                while view:
+                    view = view[os.write(fd, view):]
+                # Data must be durable before the rename makes it visible
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self._replace(tmp_path)
+            self._fsync_dir()
+            self._last_hash = digest
             log.info("Saved config to %s", self._mappings_file)
         except OSError:
             log.exception("Failed to save config")
@@ -67,6 +162,24 @@ class Storage:
             except OSError:
                 pass
 
+    def _fsync_dir(self):
+        """Persist the directory entry created by os.replace()."""
+        try:
+            dfd = os.open(self._config_dir, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dfd)
+        except OSError:
+            pass  # not supported on every filesystem
+        finally:
+            os.close(dfd)
+
+    def is_current_version(self):
+        """True if the loaded data was written with this CONFIG_VERSION."""
+        self._load()
+        return self._data.get("version") == CONFIG_VERSION
+
     def load_mappings(self):
         """Return the list of mapping dicts."""
         self._load()
@@ -76,7 +189,7 @@ class Storage:
         """Persist the list of mapping dicts."""
         self._load()
         self._data["mappings"] = mappings
-        self._save()
+        self._schedule_save()
 
     def get_setting(self, key, default=None):
         """Get a setting value."""
@@ -89,4 +202,4 @@ class Storage:
         if "settings" not in self._data:
             self._data["settings"] = {}
         self._data["settings"][key] = value
-        self._save()
+        self._schedule_save()
@@ -22,6 +22,8 @@ class MainWindow(QMainWindow):
         self._remapper = remapper
         self._key_names = key_names
         self._storage = storage
+        self._bulk = False
+        self._row_by_id = {}  # mapping id → source-column item (row anchor)
 
         self.setWindowTitle("ReKey - Keyboard Remapper")
         self.setMinimumSize(600, 400)
@@ -106,10 +108,24 @@ class MainWindow(QMainWindow):
         self._remapper.mapping_added.connect(self._on_mapping_added)
         self._remapper.mapping_removed.connect(self._on_mapping_removed)
         self._remapper.mapping_toggled.connect(self._on_mapping_toggled)
+        self._remapper.mappings_bulk_toggled.connect(self._on_mappings_bulk_toggled)
         self._remapper.error_occurred.connect(self._on_error)
 
         self._update_status()
 
+    def begin_bulk(self):
+        """Suspend table repaints while many mappings are added at once."""
+        self._bulk = True
+        self._table.setUpdatesEnabled(False)
+        self._table.blockSignals(True)
+
+    def end_bulk(self):
+        """Resume table repaints and refresh the status bar once."""
+        self._bulk = False
+        self._table.blockSignals(False)
+        self._table.setUpdatesEnabled(True)
+        self._update_status()
+
     def _on_char_changed(self, text):
         """When user types a character, clear the capture button (they're alternatives)."""
         if text:
@@ -159,6 +175,7 @@ class MainWindow(QMainWindow):
 
         src_item = QTableWidgetItem(src)
         src_item.setData(Qt.UserRole, mapping.id)
+        self._row_by_id[mapping.id] = src_item
         self._table.setItem(row, 0, src_item)
         self._table.setItem(row, 1, QTableWidgetItem(tgt))
         self._table.setItem(row, 2, QTableWidgetItem(mapping.description))
@@ -166,7 +183,8 @@ class MainWindow(QMainWindow):
         # Enabled checkbox
         cb = QCheckBox()
         cb.setChecked(mapping.enabled)
-        cb.toggled.connect(lambda checked, mid=mapping.id: self._remapper.toggle_mapping(mid, checked))
+        cb.setProperty("mapping_id", mapping.id)
+        cb.toggled.connect(self._on_checkbox_toggled)
         cb_widget = QWidget()
         cb_layout = QHBoxLayout(cb_widget)
         cb_layout.addWidget(cb)
@@ -176,18 +194,39 @@ class MainWindow(QMainWindow):
 
         # Delete button
         del_btn = QPushButton("Delete")
-        del_btn.clicked.connect(lambda _, mid=mapping.id: self._remapper.remove_mapping(mid))
+        del_btn.setProperty("mapping_id", mapping.id)
+        del_btn.clicked.connect(self._on_delete_clicked)
         self._table.setCellWidget(row, 4, del_btn)
 
-        self._update_status()
+        if not self._bulk:
+            self._update_status()
+
+    def _on_checkbox_toggled(self, checked: bool):
+        self._remapper.toggle_mapping(self.sender().property("mapping_id"), checked)
+
+    def _on_delete_clicked(self):
+        self._remapper.remove_mapping(self.sender().property("mapping_id"))
 
     def _on_mapping_removed(self, mapping_id: str):
         row = self._find_row(mapping_id)
         if row >= 0:
             self._table.removeRow(row)
+        self._row_by_id.pop(mapping_id, None)
         self._update_status()
 
     def _on_mapping_toggled(self, mapping_id: str, enabled: bool):
+        self._set_row_checked(mapping_id, enabled)
+        self._update_status()
+
+    def _on_mappings_bulk_toggled(self, mapping_ids: list, enabled: bool):
+        self._table.setUpdatesEnabled(False)
+        for mapping_id in mapping_ids:
+            self._set_row_checked(mapping_id, enabled)
+        self._table.setUpdatesEnabled(True)
+        self._update_status()
+
+    def _set_row_checked(self, mapping_id: str, enabled: bool):
+        """Update a row's Enabled checkbox without re-triggering toggle_mapping."""
         row = self._find_row(mapping_id)
         if row >= 0:
             widget = self._table.cellWidget(row, 3)
@@ -197,17 +236,13 @@ class MainWindow(QMainWindow):
                     cb.blockSignals(True)
                     cb.setChecked(enabled)
                     cb.blockSignals(False)
-        self._update_status()
 
     def _on_error(self, msg: str):
         self._status.showMessage(f"Error: {msg}", 5000)
 
     def _find_row(self, mapping_id: str):
-        for row in range(self._table.rowCount()):
-            item = self._table.item(row, 0)
-            if item and item.data(Qt.UserRole) == mapping_id:
-                return row
-        return -1
+        item = self._row_by_id.get(mapping_id)
+        return item.row() if item else -1
 
     def _update_status(self):
         count = self._remapper.active_count()
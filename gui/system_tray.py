@@ -2,7 +2,7 @@
 System tray icon with context menu.
 """
 
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QSystemTrayIcon, QMenu, QApplication, QStyle
 
@@ -13,6 +13,7 @@ class SystemTrayManager:
     def __init__(self, main_window, remapper):
         self._window = main_window
         self._remapper = remapper
+        self._tooltip_pending = False
 
         # Use a built-in icon (keyboard-like) as fallback
         icon = QApplication.instance().style().standardIcon(QStyle.SP_ComputerIcon)
@@ -35,10 +36,11 @@ class SystemTrayManager:
         self._tray.setContextMenu(menu)
         self._tray.activated.connect(self._on_activated)
 
-        # Update tooltip on mapping changes
-        self._remapper.mapping_added.connect(lambda _: self._update_tooltip())
-        self._remapper.mapping_removed.connect(lambda _: self._update_tooltip())
-        self._remapper.mapping_toggled.connect(lambda *_: self._update_tooltip())
+        # Update tooltip on mapping changes (coalesced, see _schedule_tooltip)
+        self._remapper.mapping_added.connect(self._schedule_tooltip)
+        self._remapper.mapping_removed.connect(self._schedule_tooltip)
+        self._remapper.mapping_toggled.connect(self._schedule_tooltip)
+        self._remapper.mappings_bulk_toggled.connect(self._schedule_tooltip)
 
         self._tray.show()
 
@@ -54,6 +56,14 @@ class SystemTrayManager:
         if reason == QSystemTrayIcon.Trigger:  # single click
             self._toggle_window()
 
+    def _schedule_tooltip(self, *_):
+        """Coalesce bursts of mapping changes into one tooltip update."""
+        if self._tooltip_pending:
+            return
+        self._tooltip_pending = True
+        QTimer.singleShot(100, self._update_tooltip)
+
     def _update_tooltip(self):
+        self._tooltip_pending = False
         count = self._remapper.active_count()
         self._tray.setToolTip(f"ReKey - {count} active mapping{'s' if count != 1 else ''}")
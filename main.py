@@ -11,6 +11,7 @@ import os
 # Add project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication
 
 from core.key_names import KeyNameResolver
@@ -47,15 +48,22 @@ def main():
     window = MainWindow(remapper, key_names, storage)
     tray = SystemTrayManager(window, remapper)
 
-    # Load saved mappings
-    remapper.load_from_storage()
-
     # Show window (or start minimized)
     if not storage.get_setting("start_minimized", False):
         window.show()
 
+    # Load saved mappings (and grab their keys) once the event loop is
+    # running, so the window paints first
+    def load_mappings():
+        window.begin_bulk()
+        remapper.load_from_storage()
+        window.end_bulk()
+
+    QTimer.singleShot(0, load_mappings)
+
     # Clean shutdown
     app.aboutToQuit.connect(hook.cleanup)
+    app.aboutToQuit.connect(storage.flush)
 
     sys.exit(app.exec_())
 